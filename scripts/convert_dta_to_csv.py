@@ -0,0 +1,276 @@
+"""
+Convert DHS Stata recode files (.dta) to CSV.
+
+The .dta exports are huge and stay outside the repo; only the converted
+CSVs live in data/raw (e.g. BDIR61FL.csv). Run this once after downloading
+a new recode zip:
+
+    python scripts/convert_dta_to_csv.py <dta_folder> <output_folder>
+"""
+
+import csv
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# pyarrow's CSV writer formats columns in parallel C++ and is several
+# times faster than to_csv on wide tables -- use it when available
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# one precompiled case-insensitive matcher instead of lowercasing and
+# suffix-testing every directory entry
+_DTA_RE = re.compile(r"\.dta$", re.IGNORECASE)
+
+# rows per chunk -- big enough to amortize per-chunk Python overhead,
+# small enough that peak RAM stays flat even for the multi-GB IR files
+CHUNK_ROWS = 500_000
+
+
+def _find_dta(root):
+    """Single scandir walk; DHS zips ship a mix of upper/lower-case extensions.
+
+    Yields (path, size_bytes) -- scandir hands back the stat result it
+    already fetched while listing, so the file never gets stat'ed again.
+    """
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif _DTA_RE.search(entry.name):
+                    yield Path(entry.path), entry.stat().st_size
+
+
+def _downcast(chunk):
+    """Shrink dtypes in place -- read_stata promotes everything to int64/float64
+    even though DHS variables are overwhelmingly 0-255 coded."""
+    n = len(chunk)
+    for col in chunk.columns:
+        kind = chunk[col].dtype.kind
+        if kind in "iu":
+            chunk[col] = pd.to_numeric(chunk[col], downcast="integer")
+        elif kind == "f":
+            chunk[col] = pd.to_numeric(chunk[col], downcast="float")
+        elif kind == "O" and n and chunk[col].nunique() / n < 0.5:
+            chunk[col] = chunk[col].astype("category")
+    return chunk
+
+
+def _format_columns(chunk):
+    """Format every column to strings in one vectorized call each.
+
+    Column-at-a-time formatting (one C loop per column) beats to_csv's
+    row-at-a-time object formatting when pyarrow is not around; rows are
+    only assembled at emit time.
+    """
+    formatted = []
+    for name in chunk.columns:
+        s = chunk[name]
+        mask = s.isna().to_numpy()
+        if s.dtype.kind in "iu":
+            col = s.to_numpy().astype(str)
+        else:
+            # str() is the shortest round-trip form, same text to_csv
+            # emits -- a %g-style format would silently round long values
+            col = s.astype(str).to_numpy()
+        if mask.any():
+            col = col.astype(object)
+            col[mask] = ""  # NaN renders as an empty field, like to_csv
+        formatted.append(col)
+    return formatted
+
+
+def _write_csv_chunks(reader, csv_file, compress=False):
+    """Stream chunks from a StataReader out to csv_file; returns row count."""
+    total_rows = 0
+    if pa is not None:
+        writer = None
+        sink = pa.CompressedOutputStream(str(csv_file), "zstd") if compress else str(csv_file)
+        try:
+            for chunk in reader:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pacsv.CSVWriter(sink, table.schema)
+                writer.write_table(table)
+                total_rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+            if compress:
+                sink.close()
+    else:
+        if compress:
+            import zstandard
+
+            fh_open = zstandard.open(csv_file, "wt", encoding="utf-8", newline="")
+        else:
+            fh_open = open(csv_file, "w", newline="", encoding="utf-8")
+        with fh_open as fh:
+            writer = csv.writer(fh, lineterminator="\n")
+            for chunk in reader:
+                # value-based downcast is per chunk, which is fine for text
+                # output (the Arrow path pins a schema at the first chunk,
+                # so it keeps the reader dtypes instead)
+                chunk = _downcast(chunk)
+                if total_rows == 0:
+                    writer.writerow(chunk.columns)
+                writer.writerows(np.stack(_format_columns(chunk), axis=1))
+                total_rows += len(chunk)
+    return total_rows
+
+
+def _write_parquet_chunks(reader, parquet_file):
+    """Stream chunks from a StataReader into a zstd-compressed Parquet file."""
+    total_rows = 0
+    writer = None
+    schema = None
+    try:
+        for chunk in reader:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                # read_stata types a numeric column int64 or float64 per
+                # chunk depending on whether that chunk happens to hold a
+                # missing value, but ParquetWriter pins one schema for the
+                # whole file. Promote integer fields to float64 up front so
+                # a NaN in a later chunk still fits.
+                schema = pa.schema(
+                    pa.field(f.name, pa.float64()) if pa.types.is_integer(f.type) else f
+                    for f in table.schema
+                )
+                writer = pq.ParquetWriter(str(parquet_file), schema, compression="zstd")
+            writer.write_table(table.cast(schema))
+            total_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total_rows
+
+
+def _convert_one(dta_file, dta_size, output_path, output_format="csv", verbose_sizes=False,
+                 compress=False):
+    """Convert a single .dta file. Returns (name, rows, dta_mb, out_mb, error)."""
+    if output_format == "parquet":
+        suffix = ".parquet"  # parquet is already zstd-compressed internally
+    else:
+        suffix = ".csv.zst" if compress else ".csv"
+    out_file = output_path / (dta_file.stem + suffix)
+    dta_mb = dta_size / (1024 * 1024)
+    try:
+        # Stream the Stata file chunk by chunk instead of materializing
+        # the whole DataFrame -- memory stays bounded at one chunk and
+        # the CSV write overlaps the Stata parsing.
+        reader = pd.read_stata(
+            dta_file,
+            convert_categoricals=False,
+            preserve_dtypes=False,
+            chunksize=CHUNK_ROWS,
+            iterator=True,
+        )
+        if output_format == "parquet":
+            total_rows = _write_parquet_chunks(reader, out_file)
+        else:
+            total_rows = _write_csv_chunks(reader, out_file, compress=compress)
+
+        # the post-write stat is only for reporting -- on network storage
+        # it is an extra round-trip per file, so make it opt-in
+        out_mb = out_file.stat().st_size / (1024 * 1024) if verbose_sizes else None
+        return dta_file.name, total_rows, dta_mb, out_mb, None
+    except Exception as e:
+        return dta_file.name, 0, dta_mb, None, str(e)
+
+
+def convert_dta_to_csv(input_folder, output_folder, output_format="csv", verbose_sizes=False,
+                       compress=False):
+    if output_format not in ("csv", "parquet"):
+        raise ValueError(f"output_format must be 'csv' or 'parquet', got {output_format!r}")
+    if output_format == "parquet" and pa is None:
+        raise ImportError("parquet output needs pyarrow (pip install pyarrow)")
+    if compress and pa is None:
+        # fail fast here rather than once per file inside the workers
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise ImportError("--zst output needs pyarrow or zstandard (pip install zstandard)")
+
+    input_path = Path(input_folder)
+    output_path = Path(output_folder)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    dta_files = sorted(_find_dta(input_path))
+    print(f"Found {len(dta_files)} .dta file(s) under {input_path}")
+
+    successful = 0
+    failed = 0
+
+    # Each file is an independent job and the Stata parser holds the GIL,
+    # so fan the batch out across processes -- one worker per core.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = {
+            pool.submit(
+                _convert_one, dta_file, dta_size, output_path, output_format, verbose_sizes,
+                compress,
+            ): dta_file
+            for dta_file, dta_size in dta_files
+        }
+        for future in as_completed(futures):
+            name, total_rows, dta_mb, out_mb, error = future.result()
+            if error is None:
+                if verbose_sizes:
+                    print(f"✅ {name}: {total_rows} rows, {dta_mb:.1f} MB -> {out_mb:.1f} MB")
+                else:
+                    print(f"✅ {name}: {total_rows} rows")
+                successful += 1
+            else:
+                print(f"❌ Failed on {name}: {error}")
+                failed += 1
+
+    print(f"\nDone: {successful} converted, {failed} failed")
+    return successful, failed
+
+
+if __name__ == "__main__":
+    # Import pandas/numpy/pyarrow once in a forkserver parent so every pool
+    # worker inherits the warmed-up modules (shared read-only pages) instead
+    # of paying the one-time C-extension init again. Windows only has spawn,
+    # so this is a no-op there.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        multiprocessing.set_start_method("forkserver")
+        multiprocessing.set_forkserver_preload(["pandas", "numpy", "pyarrow"])
+
+    usage = (
+        "Usage: python scripts/convert_dta_to_csv.py <input_folder> <output_folder>"
+        " [--format csv|parquet] [--zst] [--sizes]"
+    )
+    args = sys.argv[1:]
+    output_format = "csv"
+    if "--format" in args:
+        i = args.index("--format")
+        if i + 1 >= len(args) or args[i + 1] not in ("csv", "parquet"):
+            print(usage)
+            sys.exit(1)
+        output_format = args[i + 1]
+        del args[i:i + 2]
+    verbose_sizes = "--sizes" in args
+    if verbose_sizes:
+        args.remove("--sizes")
+    compress = "--zst" in args
+    if compress:
+        args.remove("--zst")
+    if len(args) != 2:
+        print(usage)
+        sys.exit(1)
+    convert_dta_to_csv(args[0], args[1], output_format=output_format, verbose_sizes=verbose_sizes,
+                       compress=compress)
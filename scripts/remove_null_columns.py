@@ -0,0 +1,252 @@
+"""
+Drop columns that carry no information (entirely NaN, or only empty
+strings) from the converted DHS CSVs, so the notebooks never have to
+load them. Same rule as the "Null Columns" step in 01_data_cleaning,
+applied in place right after conversion:
+
+    python scripts/remove_null_columns.py <csv_file_or_folder> [...]
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Arrow columns carry a null validity bitmap, so "entirely null?" is a
+# metadata lookup (null_count) with no data scan at all -- go through
+# pyarrow end to end when it is available
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+# dask turns the per-file loop into one DAG computed across processes;
+# plain serial loop when it is not installed
+try:
+    from dask import compute, delayed
+    from dask.diagnostics import ProgressBar
+except ImportError:
+    delayed = None
+
+# precompiled case-insensitive matcher for the folder walk
+_CSV_RE = re.compile(r"\.csv(\.zst)?$", re.IGNORECASE)
+
+# rows per chunk for the pandas fallback -- same budget as the converter
+CHUNK_ROWS = 500_000
+
+
+def _column_names_arrow(csv_path):
+    """Grab the header column names without committing to inferred types."""
+    # compression='detect' transparently handles the .csv.zst outputs
+    stream = pa.input_stream(str(csv_path), compression="detect")
+    try:
+        return pacsv.open_csv(stream).schema.names
+    finally:
+        stream.close()
+
+
+def _scan_null_cols_arrow(csv_path):
+    """Pass 1 (pyarrow): stream record batches, flag columns that ever hold a value."""
+    # open_csv infers types from the first block only: a column that is
+    # empty there gets typed null and the reader raises the moment a value
+    # appears later ("CSV conversion error to null") -- exactly the
+    # mostly-empty columns this scan exists to classify. Read everything
+    # as string with ''->null instead, so the scan is type-stable and
+    # "has a value" is simply "not entirely null".
+    names = _column_names_arrow(csv_path)
+    convert = pacsv.ConvertOptions(
+        column_types={name: pa.string() for name in names},
+        strings_can_be_null=True,
+    )
+    reader = pacsv.open_csv(
+        pa.input_stream(str(csv_path), compression="detect"), convert_options=convert
+    )
+    has_value = np.zeros(len(names), dtype=bool)
+    n_rows = 0
+    for batch in reader:
+        n = batch.num_rows  # hoisted: one lookup per batch, not per column
+        n_rows += n
+        for i in range(batch.num_columns):
+            if has_value[i]:
+                continue
+            # straight off the validity bitmap, no data scan
+            if batch.column(i).null_count < n:
+                has_value[i] = True
+        # already-cleaned files settle this on the first batch -- stop
+        # reading entirely once every column has shown a value (n_rows is
+        # only reported when columns get dropped, i.e. when we never stop
+        # early, so the partial count is never printed)
+        if has_value.all():
+            break
+    return names, has_value, n_rows
+
+
+def _scan_null_cols_pandas(csv_path):
+    """Pass 1 (fallback): chunked read, flag columns that ever hold a value."""
+    names = list(pd.read_csv(csv_path, nrows=0).columns)
+    has_value = np.zeros(len(names), dtype=bool)
+    n_rows = 0
+    for chunk in pd.read_csv(csv_path, chunksize=CHUNK_ROWS, low_memory=False, dtype=str):
+        n_rows += len(chunk)
+        # only ever compare the still-undecided columns -- the object-array
+        # != '' test is the expensive part, so shrink the matrix it runs on
+        idx = np.flatnonzero(~has_value)
+        sub = chunk.iloc[:, idx]
+        found = (sub.notna().to_numpy() & (sub.to_numpy() != "")).any(axis=0)
+        has_value[idx[found]] = True
+        # stop reading entirely once every column has shown a value (common
+        # case: the file was already cleaned on a previous run; n_rows is
+        # only reported when columns get dropped, i.e. when we never stop
+        # early, so the partial count is never printed)
+        if has_value.all():
+            break
+    return names, has_value, n_rows
+
+
+def _rewrite_kept_cols(csv_path, out_path, kept_cols, compressed):
+    """Pass 2: re-read only the kept columns and stream them to out_path."""
+    if pa is not None:
+        # all-string column_types for the same reason as the pass-1 scan:
+        # first-block type inference chokes on columns whose first value
+        # sits past the first block. Reading as string also makes this a
+        # pure projection -- value text passes through untouched.
+        reader = pacsv.open_csv(
+            pa.input_stream(str(csv_path), compression="detect"),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=kept_cols,
+                column_types={name: pa.string() for name in kept_cols},
+            ),
+        )
+        sink = pa.CompressedOutputStream(str(out_path), "zstd") if compressed else str(out_path)
+        writer = pacsv.CSVWriter(sink, reader.schema)
+        try:
+            for batch in reader:
+                writer.write(batch)
+        finally:
+            writer.close()
+            if compressed:
+                sink.close()
+    else:
+        if compressed:
+            import zstandard
+
+            fh_open = zstandard.open(out_path, "wt", encoding="utf-8", newline="")
+        else:
+            # big buffer: fewer write syscalls on the long sequential stream
+            fh_open = open(out_path, "w", newline="", encoding="utf-8", buffering=1 << 20)
+        with fh_open as fh:
+            first = True
+            # pandas infers zstd decompression from the .zst extension
+            for chunk in pd.read_csv(csv_path, chunksize=CHUNK_ROWS, low_memory=False,
+                                     usecols=kept_cols):
+                chunk.to_csv(fh, index=False, header=first, lineterminator="\n")
+                first = False
+
+
+def remove_null_columns(csv_path, verbose_sizes=False):
+    """Rewrite csv_path without its all-null columns.
+
+    Returns (n_columns_before, n_columns_removed). verbose_sizes adds
+    before/after file sizes to the output at the cost of two extra stat
+    calls per file.
+    """
+    csv_path = Path(csv_path)
+    if verbose_sizes:
+        size_mb = csv_path.stat().st_size / (1024 * 1024)
+        print(f"Reading {csv_path.name} ({size_mb:.1f} MB)...")
+    else:
+        print(f"Reading {csv_path.name}...")
+
+    # Pass 1: figure out which columns ever hold a value, one chunk in
+    # memory at a time -- works for files bigger than RAM.
+    if pa is not None:
+        names, has_value, n_rows = _scan_null_cols_arrow(csv_path)
+    else:
+        names, has_value, n_rows = _scan_null_cols_pandas(csv_path)
+
+    n_cols = len(names)
+    cols_to_drop = [name for name, ok in zip(names, has_value) if not ok]
+
+    if not cols_to_drop:
+        print(f"No null columns in {csv_path.name} ({n_cols} columns)")
+        return n_cols, 0
+
+    print(f"Dropping {len(cols_to_drop)} of {n_cols} columns ({n_rows} rows kept)")
+
+    # Pass 2: stream the kept columns into a sibling temp file, then swap
+    # it in with an atomic replace -- the original is never left truncated
+    # or deleted, even if the rewrite dies halfway.
+    kept_cols = [name for name, ok in zip(names, has_value) if ok]
+    tmp = csv_path.with_name(csv_path.name + ".tmp")
+    try:
+        _rewrite_kept_cols(csv_path, tmp, kept_cols, csv_path.name.endswith(".zst"))
+        os.replace(tmp, csv_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    if verbose_sizes:
+        new_mb = csv_path.stat().st_size / (1024 * 1024)
+        print(f"✅ {csv_path.name}: {size_mb:.1f} MB -> {new_mb:.1f} MB")
+    else:
+        print(f"✅ {csv_path.name}: {len(cols_to_drop)} columns dropped")
+    return n_cols, len(cols_to_drop)
+
+
+def _find_csv(root):
+    """Single directory walk, case-insensitive on the extension."""
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if _CSV_RE.search(name):
+                yield Path(dirpath) / name
+
+
+def _process_one(csv_file):
+    """process_folder worker. Returns (name, n_cols, n_removed, error)."""
+    try:
+        n_cols, n_removed = remove_null_columns(csv_file)
+        return csv_file.name, n_cols, n_removed, None
+    except Exception as e:
+        return csv_file.name, 0, 0, str(e)
+
+
+def process_folder(folder):
+    folder = Path(folder)
+    csv_files = sorted(_find_csv(folder))
+    print(f"Found {len(csv_files)} CSV file(s) under {folder}")
+
+    if delayed is not None:
+        # one delayed node per file, computed in a single pass over processes
+        tasks = [delayed(_process_one)(f) for f in csv_files]
+        with ProgressBar():
+            results = compute(*tasks, scheduler="processes", num_workers=os.cpu_count())
+    else:
+        results = [_process_one(f) for f in csv_files]
+
+    successful = 0
+    failed = 0
+    total_removed = 0
+    for name, n_cols, n_removed, error in results:
+        if error is None:
+            successful += 1
+            total_removed += n_removed
+        else:
+            failed += 1
+            print(f"❌ Failed on {name}: {error}")
+
+    print(f"\nDone: {successful} cleaned ({total_removed} columns dropped), {failed} failed")
+    return successful, failed
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/remove_null_columns.py <csv_file_or_folder> [...]")
+        sys.exit(1)
+    for path in sys.argv[1:]:
+        if Path(path).is_dir():
+            process_folder(path)
+        else:
+            remove_null_columns(path)